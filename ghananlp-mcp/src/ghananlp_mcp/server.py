@@ -21,10 +21,19 @@ Supported languages:
 
 import asyncio
 import base64
+import math
 import os
-from typing import Any
+import random
+import urllib.request
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, TypeVar
+from urllib.parse import urlsplit
 
 import httpx
+import orjson
+from cachetools import TTLCache
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -33,13 +42,31 @@ from mcp.types import (
     INVALID_PARAMS,
     INTERNAL_ERROR,
 )
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 # API Configuration
 BASE_URL = "https://translation-api.ghananlp.org"
 API_KEY_HEADER = "Ocp-Apim-Subscription-Key"
 
+# Static request headers; the API key is merged in by json_headers/audio_headers
+_JSON_HEADERS_BASE = {
+    "Content-Type": "application/json",
+    "Cache-Control": "no-cache",
+}
+_AUDIO_HEADERS_BASE = {
+    "Content-Type": "audio/mpeg",
+    "Cache-Control": "no-cache",
+}
+
+# ASCII whitespace removed from base64 audio that fails strict decoding
+_B64_WHITESPACE_CHARS = " \t\n\r\v\f"
+_B64_WHITESPACE = str.maketrans("", "", _B64_WHITESPACE_CHARS)
+
+# Base64 work on more than this many bytes runs in a worker thread so it
+# does not stall other tool calls on the event loop
+BASE64_OFFLOAD_THRESHOLD = 256_000
+
 # Supported language pairs for translation
 TRANSLATION_PAIRS = [
     "en-tw",  # English to Twi
@@ -65,12 +92,191 @@ TRANSLATION_PAIRS = [
 # Supported languages for ASR
 ASR_LANGUAGES = ["tw", "ee", "gaa", "dag", "fat", "gur", "ki", "luo", "mer"]
 
+# File types accepted for ASR uploads from a local audio_path
+ASR_AUDIO_EXTENSIONS = (".wav", ".mp3")
+
 # Supported languages for TTS
 TTS_LANGUAGES = ["tw", "ee", "gaa", "dag", "fat", "gur", "ki", "luo", "mer"]
 
+# Set versions of the above for constant-time validation
+TRANSLATION_PAIRS_SET = frozenset(TRANSLATION_PAIRS)
+ASR_LANGUAGES_SET = frozenset(ASR_LANGUAGES)
+TTS_LANGUAGES_SET = frozenset(TTS_LANGUAGES)
+
+# Comma-separated lists for schema descriptions and error messages
+_TRANSLATION_PAIRS_JOINED = ", ".join(TRANSLATION_PAIRS)
+_ASR_LANGUAGES_JOINED = ", ".join(ASR_LANGUAGES)
+_TTS_LANGUAGES_JOINED = ", ".join(TTS_LANGUAGES)
+
+# Shared HTTP client (created lazily, reused across tool calls so the
+# connection to the API host is kept alive between requests)
+_client: httpx.AsyncClient | None = None
+
+
+def get_env_proxy() -> str | None:
+    """Get the proxy for BASE_URL from HTTPS_PROXY/ALL_PROXY, honouring NO_PROXY."""
+    proxies = urllib.request.getproxies()
+    proxy = proxies.get("https") or proxies.get("all")
+    if proxy and urllib.request.proxy_bypass(urlsplit(BASE_URL).hostname):
+        return None
+    return proxy
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            # Connection settings live on the transport, which also retries
+            # failed connection attempts. httpx ignores proxy environment
+            # variables when a transport is given, so pass the proxy here.
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                proxy=get_env_proxy(),
+                limits=httpx.Limits(
+                    max_connections=100,
+                    # HTTP/2 multiplexes concurrent requests over a single
+                    # connection, so only a handful need to be kept alive
+                    max_keepalive_connections=5,
+                    keepalive_expiry=300,
+                ),
+            ),
+            timeout=httpx.Timeout(60.0),
+        )
+    return _client
+
 
+# Limit on concurrent upstream requests across all tools, so bursts of
+# tool calls do not exceed the API's rate limit
+_api_semaphore = asyncio.Semaphore(10)
+
+# Responses that are retried with backoff (rate limiting and gateway errors)
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+MAX_RETRY_DELAY = 10.0
+
+
+def retry_delay(attempt: int, response: httpx.Response) -> float:
+    """Seconds to wait before retrying, honouring a numeric Retry-After header."""
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            seconds = math.nan
+        # Non-finite values ("nan", "inf") would make asyncio.sleep never return
+        if math.isfinite(seconds):
+            return min(max(seconds, 0.0), MAX_RETRY_DELAY)
+    return 2 ** attempt * 0.2 + random.random() * 0.1
+
+
+@asynccontextmanager
+async def api_stream(url: str, content: Callable[[], Any], **kwargs: Any) -> AsyncIterator[httpx.Response]:
+    """Open a streamed POST to the API, retrying on RETRY_STATUSES.
+
+    content is called for each attempt so streamed bodies can be replayed.
+    The final response is yielded unread and without raise_for_status().
+    """
+    client = get_http_client()
+    for attempt in range(MAX_RETRIES + 1):
+        async with _api_semaphore:
+            async with client.stream("POST", url, content=content(), **kwargs) as response:
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    yield response
+                    return
+                delay = retry_delay(attempt, response)
+        await asyncio.sleep(delay)
+
+
+async def shutdown() -> None:
+    """Close the shared HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Translation results keyed by (language_pair, text). Translations are
+# deterministic for a given model, so they can be served from memory.
+_translate_cache: TTLCache = TTLCache(maxsize=10_000, ttl=86400)
+
+# Upstream translation requests currently in progress, keyed like the cache
+_inflight_translate: dict[tuple[str, str], asyncio.Task[str]] = {}
+
+# Limit on concurrent upstream translation requests, so a burst of
+# translations (e.g. subtitles) does not crowd out ASR and TTS calls
+_translate_semaphore = asyncio.Semaphore(8)
+
+# Synthesized audio keyed by (language, text), stored as (audio_base64,
+# content_type) in least-recently-used order and bounded by total size
+TTS_CACHE_MAX_BYTES = 50_000_000
+_tts_cache: OrderedDict[tuple[str, str], tuple[str, str]] = OrderedDict()
+_tts_cache_bytes = 0
+
+# Upstream TTS requests currently in progress, keyed like the cache
+_inflight_tts: dict[tuple[str, str], asyncio.Task[tuple[str, str]]] = {}
+
+
+def _tts_cache_get(key: tuple[str, str]) -> tuple[str, str] | None:
+    """Look up cached audio for key, marking it as recently used."""
+    entry = _tts_cache.get(key)
+    if entry is not None:
+        _tts_cache.move_to_end(key)
+    return entry
+
+
+def _tts_cache_put(key: tuple[str, str], entry: tuple[str, str]) -> None:
+    """Store audio for key, evicting least recently used entries over the cap."""
+    global _tts_cache_bytes
+    size = len(entry[0])
+    if size > TTS_CACHE_MAX_BYTES:
+        return
+
+    previous = _tts_cache.pop(key, None)
+    if previous is not None:
+        _tts_cache_bytes -= len(previous[0])
+
+    _tts_cache[key] = entry
+    _tts_cache_bytes += size
+    while _tts_cache_bytes > TTS_CACHE_MAX_BYTES:
+        _, (evicted, _) = _tts_cache.popitem(last=False)
+        _tts_cache_bytes -= len(evicted)
+
+
+def _tts_cache_clear() -> None:
+    """Drop all cached audio."""
+    global _tts_cache_bytes
+    _tts_cache.clear()
+    _tts_cache_bytes = 0
+
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+async def _coalesce(
+    inflight: dict[K, asyncio.Task[T]],
+    key: K,
+    fetch: Callable[[], Awaitable[T]],
+) -> T:
+    """Await the in-progress request for key, or start one with fetch().
+
+    Concurrent callers asking for the same key share a single upstream call.
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # Shield so one caller being cancelled does not cancel the shared request
+    return await asyncio.shield(task)
+
+
+@lru_cache(maxsize=1)
 def get_api_key() -> str:
-    """Get API key from environment variable."""
+    """Get API key from environment variable (read once and cached)."""
     api_key = os.environ.get("GHANANLP_API_KEY")
     if not api_key:
         raise ValueError(
@@ -80,43 +286,68 @@ def get_api_key() -> str:
     return api_key
 
 
+@lru_cache(maxsize=4)
+def json_headers(api_key: str) -> dict[str, str]:
+    """Headers for JSON requests. The returned dict is shared; do not mutate it."""
+    return _JSON_HEADERS_BASE | {API_KEY_HEADER: api_key}
+
+
+@lru_cache(maxsize=4)
+def audio_headers(api_key: str) -> dict[str, str]:
+    """Headers for audio uploads. The returned dict is shared; do not mutate it."""
+    return _AUDIO_HEADERS_BASE | {API_KEY_HEADER: api_key}
+
+
 class TranslateInput(BaseModel):
     """Input schema for translation."""
     text: str = Field(description="The text to translate")
     language_pair: str = Field(
-        description=f"Language pair in format 'source-target'. Supported pairs: {', '.join(TRANSLATION_PAIRS)}"
+        description=f"Language pair in format 'source-target'. Supported pairs: {_TRANSLATION_PAIRS_JOINED}"
     )
 
 
 class ASRInput(BaseModel):
     """Input schema for speech-to-text."""
-    audio_base64: str = Field(
+    audio_base64: str | None = Field(
+        default=None,
         description="Base64-encoded audio data (WAV or MP3 format)"
     )
+    audio_path: str | None = Field(
+        default=None,
+        description=(
+            "Path to a local .wav or .mp3 file on the machine running this server, uploaded without "
+            "base64 encoding. Use instead of audio_base64. Relative paths resolve against the server's "
+            "working directory, not the client's. If GHANANLP_AUDIO_DIR is set, the file must be inside it."
+        )
+    )
     language: str = Field(
-        description=f"Target language code. Supported: {', '.join(ASR_LANGUAGES)}"
+        description=f"Target language code. Supported: {_ASR_LANGUAGES_JOINED}"
     )
 
+    @model_validator(mode="after")
+    def check_audio_source(self) -> "ASRInput":
+        if (self.audio_base64 is None) == (self.audio_path is None):
+            raise ValueError("Provide exactly one of audio_base64 or audio_path")
+        return self
+
 
 class TTSInput(BaseModel):
     """Input schema for text-to-speech."""
     text: str = Field(description="The text to convert to speech")
     language: str = Field(
-        description=f"Language code for speech synthesis. Supported: {', '.join(TTS_LANGUAGES)}"
+        description=f"Language code for speech synthesis. Supported: {_TTS_LANGUAGES_JOINED}"
     )
 
 
-# Initialize MCP server
-server = Server("ghananlp-mcp")
-
+# Input schemas and tool definitions are static, so build them once
+_TRANSLATE_SCHEMA = TranslateInput.model_json_schema()
+_ASR_SCHEMA = ASRInput.model_json_schema()
+_TTS_SCHEMA = TTSInput.model_json_schema()
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List all available GhanaNLP tools."""
-    return [
-        Tool(
-            name="ghananlp_translate",
-            description="""Translate text between English and Ghanaian/African languages.
+_TOOLS = [
+    Tool(
+        name="ghananlp_translate",
+        description="""Translate text between English and Ghanaian/African languages.
 
 Supported language pairs:
 - English to: Twi (en-tw), Ewe (en-ee), Ga (en-gaa), Dagbani (en-dag), Fante (en-fat), Gurene (en-gur), Kikuyu (en-ki), Luo (en-luo), Kimeru (en-mer)
@@ -124,24 +355,24 @@ Supported language pairs:
 
 Example: Translate "Hello, how are you?" from English to Twi using language_pair="en-tw"
 """,
-            inputSchema=TranslateInput.model_json_schema(),
-        ),
-        Tool(
-            name="ghananlp_asr",
-            description="""Convert speech audio to text (Automatic Speech Recognition).
+        inputSchema=_TRANSLATE_SCHEMA,
+    ),
+    Tool(
+        name="ghananlp_asr",
+        description="""Convert speech audio to text (Automatic Speech Recognition).
 
 Transcribes audio files in Ghanaian/African languages to text.
 
 Supported languages: Twi (tw), Ewe (ee), Ga (gaa), Dagbani (dag), Fante (fat), Gurene (gur), Kikuyu (ki), Luo (luo), Kimeru (mer)
 
-Input: Base64-encoded audio data (WAV or MP3 format)
+Input: Base64-encoded audio data (audio_base64) or a local file path (audio_path), WAV or MP3 format
 Output: Transcribed text in the specified language
 """,
-            inputSchema=ASRInput.model_json_schema(),
-        ),
-        Tool(
-            name="ghananlp_tts",
-            description="""Convert text to speech (Text-to-Speech).
+        inputSchema=_ASR_SCHEMA,
+    ),
+    Tool(
+        name="ghananlp_tts",
+        description="""Convert text to speech (Text-to-Speech).
 
 Generates natural-sounding audio from text in Ghanaian/African languages.
 
@@ -150,9 +381,19 @@ Supported languages: Twi (tw), Ewe (ee), Ga (gaa), Dagbani (dag), Fante (fat), G
 Input: Text to synthesize and target language
 Output: Base64-encoded audio data (can be saved as MP3/WAV file)
 """,
-            inputSchema=TTSInput.model_json_schema(),
-        ),
-    ]
+        inputSchema=_TTS_SCHEMA,
+    ),
+]
+
+
+# Initialize MCP server
+server = Server("ghananlp-mcp")
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List all available GhanaNLP tools."""
+    return _TOOLS
 
 
 @server.call_tool()
@@ -173,6 +414,35 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
 
+async def fetch_translation(api_key: str, text: str, language_pair: str) -> str:
+    """Call the translation API and cache the result."""
+    url = "/v1/translate"
+    headers = json_headers(api_key)
+    payload = {
+        "in": text,
+        "lang": language_pair,
+    }
+
+    body = orjson.dumps(payload)
+    async with _translate_semaphore:
+        async with api_stream(url, lambda: body, headers=headers, timeout=30.0) as response:
+            content = await response.aread()
+    response.raise_for_status()
+    result = orjson.loads(content)
+
+    # The API typically returns the translation directly or in a specific field
+    if isinstance(result, str):
+        translated_text = result
+    elif isinstance(result, dict):
+        # Try common response field names
+        translated_text = result.get("translation") or result.get("output") or result.get("text") or str(result)
+    else:
+        translated_text = str(result)
+
+    _translate_cache[(language_pair, text)] = translated_text
+    return translated_text
+
+
 async def handle_translate(api_key: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle translation requests."""
     try:
@@ -181,44 +451,29 @@ async def handle_translate(api_key: str, arguments: dict[str, Any]) -> list[Text
         return [TextContent(type="text", text=f"Invalid input: {str(e)}")]
 
     # Validate language pair
-    if input_data.language_pair not in TRANSLATION_PAIRS:
+    if input_data.language_pair not in TRANSLATION_PAIRS_SET:
         return [TextContent(
             type="text",
-            text=f"Invalid language pair '{input_data.language_pair}'. Supported pairs: {', '.join(TRANSLATION_PAIRS)}"
+            text=f"Invalid language pair '{input_data.language_pair}'. Supported pairs: {_TRANSLATION_PAIRS_JOINED}"
         )]
 
-    url = f"{BASE_URL}/v1/translate"
-    headers = {
-        "Content-Type": "application/json",
-        "Cache-Control": "no-cache",
-        API_KEY_HEADER: api_key,
-    }
-    payload = {
-        "in": input_data.text,
-        "lang": input_data.language_pair,
-    }
+    key = (input_data.language_pair, input_data.text)
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            result = response.json()
-
-            # The API typically returns the translation directly or in a specific field
-            if isinstance(result, str):
-                translated_text = result
-            elif isinstance(result, dict):
-                # Try common response field names
-                translated_text = result.get("translation") or result.get("output") or result.get("text") or str(result)
-            else:
-                translated_text = str(result)
+        translated_text = _translate_cache.get(key)
+        if translated_text is None:
+            translated_text = await _coalesce(
+                _inflight_translate,
+                key,
+                lambda: fetch_translation(api_key, input_data.text, input_data.language_pair),
+            )
 
-            return [TextContent(
-                type="text",
-                text=f"**Translation ({input_data.language_pair}):**\n\n"
-                     f"**Original:** {input_data.text}\n\n"
-                     f"**Translated:** {translated_text}"
-            )]
+        return [TextContent(
+            type="text",
+            text=f"**Translation ({input_data.language_pair}):**\n\n"
+                 f"**Original:** {input_data.text}\n\n"
+                 f"**Translated:** {translated_text}"
+        )]
 
     except httpx.HTTPStatusError as e:
         error_detail = ""
@@ -234,6 +489,57 @@ async def handle_translate(api_key: str, arguments: dict[str, Any]) -> list[Text
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
+def decode_audio_base64(audio_base64: str) -> bytes:
+    """Decode base64 audio strictly, allowing ASCII whitespace such as line breaks."""
+    try:
+        if len(audio_base64) % 4:
+            raise ValueError("incorrectly padded")
+        return base64.b64decode(audio_base64, validate=True)
+    except ValueError:
+        # Strict decoding rejects whitespace; anything else is malformed, so
+        # fail without copying the string
+        if not any(ws in audio_base64 for ws in _B64_WHITESPACE_CHARS):
+            raise
+
+    # Slow path: remove the whitespace and retry
+    stripped = audio_base64.translate(_B64_WHITESPACE)
+    if len(stripped) % 4:
+        raise ValueError("incorrectly padded")
+    return base64.b64decode(stripped, validate=True)
+
+
+def resolve_audio_path(audio_path: str) -> tuple[str, int]:
+    """Resolve audio_path, check it may be uploaded for ASR, and get its size.
+
+    The file must be a regular .wav or .mp3 file and, if GHANANLP_AUDIO_DIR
+    is set, inside that directory. Symlinks are resolved before checking.
+    This touches the filesystem, so call it via asyncio.to_thread.
+    """
+    path = os.path.realpath(audio_path)
+    if not path.lower().endswith(ASR_AUDIO_EXTENSIONS):
+        raise ValueError(f"only {', '.join(ASR_AUDIO_EXTENSIONS)} files can be uploaded: {audio_path}")
+
+    audio_dir = os.environ.get("GHANANLP_AUDIO_DIR")
+    if audio_dir:
+        root = os.path.realpath(audio_dir)
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"file is outside GHANANLP_AUDIO_DIR: {audio_path}")
+
+    if not os.path.isfile(path):
+        raise ValueError(f"not a file: {audio_path}")
+    return path, os.path.getsize(path)
+
+
+async def read_file_chunks(path: str, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    """Read a file in chunks for streaming uploads, without blocking the event loop."""
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+    finally:
+        f.close()
+
+
 async def handle_asr(api_key: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle speech-to-text requests."""
     try:
@@ -242,44 +548,53 @@ async def handle_asr(api_key: str, arguments: dict[str, Any]) -> list[TextConten
         return [TextContent(type="text", text=f"Invalid input: {str(e)}")]
 
     # Validate language
-    if input_data.language not in ASR_LANGUAGES:
+    if input_data.language not in ASR_LANGUAGES_SET:
         return [TextContent(
             type="text",
-            text=f"Invalid language '{input_data.language}'. Supported languages: {', '.join(ASR_LANGUAGES)}"
+            text=f"Invalid language '{input_data.language}'. Supported languages: {_ASR_LANGUAGES_JOINED}"
         )]
 
-    # Decode base64 audio
-    try:
-        audio_data = base64.b64decode(input_data.audio_base64)
-    except Exception as e:
-        return [TextContent(type="text", text=f"Invalid base64 audio data: {str(e)}")]
-
-    url = f"{BASE_URL}/asr/v1/transcribe"
-    headers = {
-        "Content-Type": "audio/mpeg",
-        "Cache-Control": "no-cache",
-        API_KEY_HEADER: api_key,
-    }
+    url = "/asr/v1/transcribe"
+    headers = audio_headers(api_key)
     params = {"language": input_data.language}
 
-    try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, content=audio_data, headers=headers, params=params)
-            response.raise_for_status()
-            result = response.json()
-
-            # Extract transcription from response
-            if isinstance(result, str):
-                transcription = result
-            elif isinstance(result, dict):
-                transcription = result.get("transcription") or result.get("text") or result.get("output") or str(result)
+    if input_data.audio_path is not None:
+        # Stream the file straight from disk
+        try:
+            audio_path, audio_size = await asyncio.to_thread(resolve_audio_path, input_data.audio_path)
+            headers = headers | {"Content-Length": str(audio_size)}
+        except (ValueError, OSError) as e:
+            return [TextContent(type="text", text=f"Invalid audio file: {str(e)}")]
+        audio_content = lambda: read_file_chunks(audio_path)
+    else:
+        # Decode base64 audio
+        try:
+            if len(input_data.audio_base64) > BASE64_OFFLOAD_THRESHOLD:
+                audio_data = await asyncio.to_thread(decode_audio_base64, input_data.audio_base64)
             else:
-                transcription = str(result)
+                audio_data = decode_audio_base64(input_data.audio_base64)
+        except Exception as e:
+            return [TextContent(type="text", text=f"Invalid base64 audio data: {str(e)}")]
+        audio_content = lambda: audio_data
 
-            return [TextContent(
-                type="text",
-                text=f"**Speech-to-Text Transcription ({input_data.language}):**\n\n{transcription}"
-            )]
+    try:
+        async with api_stream(url, audio_content, headers=headers, params=params) as response:
+            body = await response.aread()
+        response.raise_for_status()
+        result = orjson.loads(body)
+
+        # Extract transcription from response
+        if isinstance(result, str):
+            transcription = result
+        elif isinstance(result, dict):
+            transcription = result.get("transcription") or result.get("text") or result.get("output") or str(result)
+        else:
+            transcription = str(result)
+
+        return [TextContent(
+            type="text",
+            text=f"**Speech-to-Text Transcription ({input_data.language}):**\n\n{transcription}"
+        )]
 
     except httpx.HTTPStatusError as e:
         error_detail = ""
@@ -295,6 +610,75 @@ async def handle_asr(api_key: str, arguments: dict[str, Any]) -> list[TextConten
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
+async def b64encode_stream(chunks: AsyncIterator[bytes]) -> str:
+    """Base64-encode a byte stream incrementally as chunks arrive."""
+    encoded = bytearray()
+    pending = b""
+    async for chunk in chunks:
+        data = pending + chunk if pending else chunk
+        # Encode whole 3-byte groups now and carry the remainder over
+        cut = len(data) - len(data) % 3
+        view = memoryview(data)
+        encoded += base64.b64encode(view[:cut])
+        pending = bytes(view[cut:])
+    encoded += base64.b64encode(pending)
+    if len(encoded) > BASE64_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(encoded.decode, "ascii")
+    return encoded.decode("ascii")
+
+
+async def fetch_speech(api_key: str, text: str, language: str) -> tuple[str, str]:
+    """Call the TTS API and cache the base64-encoded audio and its content type."""
+    url = "/tts/v1/tts"
+    headers = json_headers(api_key)
+    payload = {
+        "text": text,
+        "language": language,
+    }
+
+    body = orjson.dumps(payload)
+    async with api_stream(url, lambda: body, headers=headers) as response:
+        if response.is_error:
+            # Load the error body so it can be reported
+            await response.aread()
+        response.raise_for_status()
+
+        # Determine audio format from content-type
+        content_type = response.headers.get("content-type", "audio/mpeg")
+
+        # The response is audio binary data, encoded as it arrives
+        audio_base64 = await b64encode_stream(response.aiter_bytes())
+
+    _tts_cache_put((language, text), (audio_base64, content_type))
+    return audio_base64, content_type
+
+
+# Fixed parts of the TTS tool output
+_TTS_HEADING = "**Text-to-Speech Audio Generated ("
+_TTS_INPUT_TEXT = "):**\n\n**Input Text:** "
+_TTS_AUDIO_FORMAT = "\n\n**Audio Format:** "
+_TTS_AUDIO_DATA = "\n\n**Audio Data (Base64):**\n```\n"
+_TTS_FOOTER = (
+    "\n```\n\n"
+    "To use this audio, decode the base64 string and save it as an audio file (e.g., output.mp3)."
+)
+
+
+def format_tts_result(language: str, text: str, content_type: str, audio_base64: str) -> str:
+    """Format the TTS tool output.
+
+    The base64 audio dominates the output size, so the pieces are joined
+    once rather than going through a multi-part f-string.
+    """
+    return "".join([
+        _TTS_HEADING, language,
+        _TTS_INPUT_TEXT, text,
+        _TTS_AUDIO_FORMAT, content_type,
+        _TTS_AUDIO_DATA, audio_base64,
+        _TTS_FOOTER,
+    ])
+
+
 async def handle_tts(api_key: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle text-to-speech requests."""
     try:
@@ -303,43 +687,29 @@ async def handle_tts(api_key: str, arguments: dict[str, Any]) -> list[TextConten
         return [TextContent(type="text", text=f"Invalid input: {str(e)}")]
 
     # Validate language
-    if input_data.language not in TTS_LANGUAGES:
+    if input_data.language not in TTS_LANGUAGES_SET:
         return [TextContent(
             type="text",
-            text=f"Invalid language '{input_data.language}'. Supported languages: {', '.join(TTS_LANGUAGES)}"
+            text=f"Invalid language '{input_data.language}'. Supported languages: {_TTS_LANGUAGES_JOINED}"
         )]
 
-    url = f"{BASE_URL}/tts/v1/tts"
-    headers = {
-        "Content-Type": "application/json",
-        "Cache-Control": "no-cache",
-        API_KEY_HEADER: api_key,
-    }
-    payload = {
-        "text": input_data.text,
-        "language": input_data.language,
-    }
+    key = (input_data.language, input_data.text)
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-
-            # The response is audio binary data
-            audio_data = response.content
-            audio_base64 = base64.b64encode(audio_data).decode("utf-8")
-
-            # Determine audio format from content-type
-            content_type = response.headers.get("content-type", "audio/mpeg")
-            
-            return [TextContent(
-                type="text",
-                text=f"**Text-to-Speech Audio Generated ({input_data.language}):**\n\n"
-                     f"**Input Text:** {input_data.text}\n\n"
-                     f"**Audio Format:** {content_type}\n\n"
-                     f"**Audio Data (Base64):**\n```\n{audio_base64}\n```\n\n"
-                     f"To use this audio, decode the base64 string and save it as an audio file (e.g., output.mp3)."
-            )]
+        cached = _tts_cache_get(key)
+        if cached is None:
+            audio_base64, content_type = await _coalesce(
+                _inflight_tts,
+                key,
+                lambda: fetch_speech(api_key, input_data.text, input_data.language),
+            )
+        else:
+            audio_base64, content_type = cached
+
+        return [TextContent(
+            type="text",
+            text=format_tts_result(input_data.language, input_data.text, content_type, audio_base64)
+        )]
 
     except httpx.HTTPStatusError as e:
         error_detail = ""
@@ -357,17 +727,26 @@ async def handle_tts(api_key: str, arguments: dict[str, Any]) -> list[TextConten
 
 async def run_server():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options(),
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options(),
+            )
+    finally:
+        await shutdown()
 
 
 def main():
     """Main entry point."""
-    asyncio.run(run_server())
+    try:
+        # uvloop is optional (not available on Windows)
+        import uvloop
+    except ImportError:
+        asyncio.run(run_server())
+    else:
+        uvloop.run(run_server())
 
 
 if __name__ == "__main__":
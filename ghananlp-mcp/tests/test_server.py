@@ -1,7 +1,12 @@
 """Tests for GhanaNLP MCP Server."""
 
 import asyncio
+import base64
 import os
+from contextlib import asynccontextmanager
+from typing import Any
+import httpx
+import orjson
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 
@@ -12,12 +17,95 @@ from ghananlp_mcp.server import (
     handle_translate,
     handle_asr,
     handle_tts,
+    get_api_key,
+    get_http_client,
+    main,
+    shutdown,
+    b64encode_stream,
+    decode_audio_base64,
+    resolve_audio_path,
+    retry_delay,
+    MAX_RETRIES,
     TRANSLATION_PAIRS,
     ASR_LANGUAGES,
     TTS_LANGUAGES,
+    TRANSLATION_PAIRS_SET,
+    ASR_LANGUAGES_SET,
+    TTS_LANGUAGES_SET,
+    _translate_cache,
+    _tts_cache,
+    _tts_cache_clear,
+    _tts_cache_put,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty caches."""
+    get_api_key.cache_clear()
+    _translate_cache.clear()
+    _tts_cache_clear()
+    yield
+    get_api_key.cache_clear()
+    _translate_cache.clear()
+    _tts_cache_clear()
+
+
+def json_response(value: Any) -> MagicMock:
+    """Build a mock streamed response with a JSON body."""
+    response = MagicMock()
+    response.status_code = 200
+    response.is_error = False
+    response.aread = AsyncMock(return_value=orjson.dumps(value))
+    return response
+
+
+def audio_response(content: bytes, chunk_size: int = 4) -> MagicMock:
+    """Build a mock streamed audio response delivering content in chunks."""
+    response = MagicMock()
+    response.status_code = 200
+    response.is_error = False
+    response.headers = {"content-type": "audio/mpeg"}
+
+    async def aiter_bytes():
+        for i in range(0, len(content), chunk_size):
+            yield content[i:i + chunk_size]
+
+    response.aiter_bytes = aiter_bytes
+    return response
+
+
+class StreamRecorder:
+    """Stand-in for client.stream() that records requests and replies via handler."""
+
+    def __init__(self):
+        self.requests: list[dict[str, Any]] = []
+        self.handler = None
+
+    def respond(self, *responses: Any) -> None:
+        """Reply with the given responses in order, repeating the last one."""
+        queue = list(responses)
+
+        async def handler(url, **kwargs):
+            return queue.pop(0) if len(queue) > 1 else queue[0]
+
+        self.handler = handler
+
+    @asynccontextmanager
+    async def __call__(self, method, url, **kwargs):
+        self.requests.append({"method": method, "url": url, **kwargs})
+        yield await self.handler(url, **kwargs)
+
+
+@pytest.fixture
+def api():
+    """Replace the shared client's stream() with a StreamRecorder."""
+    recorder = StreamRecorder()
+    with patch("ghananlp_mcp.server.get_http_client") as mock_client:
+        mock_client.return_value.stream = recorder
+        yield recorder
+
+
 class TestListTools:
     """Test tool listing."""
 
@@ -47,6 +135,64 @@ class TestListTools:
             assert tool.inputSchema is not None
 
 
+class TestApiKey:
+    """Test API key lookup."""
+
+    def test_api_key_is_cached(self):
+        """Test the API key is read from the environment only once."""
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "first-key"}):
+            assert get_api_key() == "first-key"
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "second-key"}):
+            assert get_api_key() == "first-key"
+
+
+class TestRetry:
+    """Test retrying rate-limited and unavailable responses."""
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self, api):
+        """Test a 503 followed by success returns the translation."""
+        unavailable = httpx.Response(503, request=httpx.Request("POST", "https://example.test"))
+        api.respond(unavailable, json_response("Wo ho te sɛn?"))
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            with patch("ghananlp_mcp.server.retry_delay", return_value=0):
+                result = await call_tool("ghananlp_translate", {
+                    "text": "How are you?",
+                    "language_pair": "en-tw"
+                })
+                assert "Wo ho te sɛn?" in result[0].text
+                assert len(api.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, api):
+        """Test the last rate-limited response is reported as an API error."""
+        api.respond(httpx.Response(
+            429, text="Too many requests", request=httpx.Request("POST", "https://example.test")
+        ))
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            with patch("ghananlp_mcp.server.retry_delay", return_value=0):
+                result = await call_tool("ghananlp_translate", {
+                    "text": "How are you?",
+                    "language_pair": "en-tw"
+                })
+                assert "API Error (429)" in result[0].text
+                assert len(api.requests) == MAX_RETRIES + 1
+
+    def test_retry_delay_honours_retry_after(self):
+        """Test Retry-After is used when numeric, and backoff otherwise."""
+        request = httpx.Request("POST", "https://example.test")
+        with_header = httpx.Response(429, headers={"Retry-After": "2"}, request=request)
+        without_header = httpx.Response(429, request=request)
+        assert retry_delay(0, with_header) == 2.0
+        assert 0.2 <= retry_delay(0, without_header) <= 0.3
+        assert 0.8 <= retry_delay(2, without_header) <= 0.9
+        for value in ("nan", "inf", "-inf", "soon"):
+            odd_header = httpx.Response(429, headers={"Retry-After": value}, request=request)
+            assert 0.2 <= retry_delay(0, odd_header) <= 0.3
+
+
 class TestTranslation:
     """Test translation functionality."""
 
@@ -75,24 +221,72 @@ class TestTranslation:
             assert "Invalid language pair" in result[0].text
 
     @pytest.mark.asyncio
-    async def test_translate_success(self):
+    async def test_translate_success(self, api):
         """Test successful translation."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = "Wo ho te sɛn?"
-        mock_response.raise_for_status = MagicMock()
+        api.respond(json_response("Wo ho te sɛn?"))
 
         with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
-            with patch("httpx.AsyncClient") as mock_client:
-                mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                    return_value=mock_response
-                )
-                result = await call_tool("ghananlp_translate", {
-                    "text": "How are you?",
-                    "language_pair": "en-tw"
-                })
-                assert len(result) == 1
-                assert "Translation" in result[0].text
-                assert "How are you?" in result[0].text
+            result = await call_tool("ghananlp_translate", {
+                "text": "How are you?",
+                "language_pair": "en-tw"
+            })
+            assert len(result) == 1
+            assert "Translation" in result[0].text
+            assert "How are you?" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_translate_cached(self, api):
+        """Test repeated translations are served from the cache."""
+        api.respond(json_response("Wo ho te sɛn?"))
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            args = {"text": "How are you?", "language_pair": "en-tw"}
+            first = await call_tool("ghananlp_translate", args)
+            second = await call_tool("ghananlp_translate", args)
+            assert first[0].text == second[0].text
+            assert len(api.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_translate_concurrent_requests_coalesced(self, api):
+        """Test concurrent identical translations share one upstream call."""
+        async def slow_reply(url, **kwargs):
+            await asyncio.sleep(0.01)
+            return json_response("Wo ho te sɛn?")
+
+        api.handler = slow_reply
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            args = {"text": "How are you?", "language_pair": "en-tw"}
+            results = await asyncio.gather(
+                *(call_tool("ghananlp_translate", args) for _ in range(5))
+            )
+            assert all("Wo ho te sɛn?" in r[0].text for r in results)
+            assert len(api.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_translate_concurrency_is_bounded(self, api):
+        """Test a burst of distinct translations is limited in flight."""
+        mock_response = json_response("Wo ho te sɛn?")
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_reply(url, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return mock_response
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            with patch("ghananlp_mcp.server._translate_semaphore", asyncio.Semaphore(8)):
+                api.handler = slow_reply
+                await asyncio.gather(*(
+                    call_tool("ghananlp_translate", {"text": f"Line {i}", "language_pair": "en-tw"})
+                    for i in range(20)
+                ))
+                assert len(api.requests) == 20
+                assert max_in_flight == 8
 
 
 class TestASR:
@@ -120,6 +314,164 @@ class TestASR:
             assert len(result) == 1
             assert "Invalid base64" in result[0].text or "Error" in result[0].text
 
+    @pytest.mark.asyncio
+    async def test_asr_incorrect_padding(self):
+        """Test ASR rejects base64 whose length is not a multiple of four."""
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_asr", {
+                "audio_base64": "SGVsbG8",
+                "language": "tw"
+            })
+            assert len(result) == 1
+            assert "Invalid base64" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_asr_accepts_line_wrapped_base64(self, api):
+        """Test ASR decodes base64 split across lines."""
+        api.respond(json_response({"transcription": "Akwaaba"}))
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_asr", {
+                "audio_base64": "SGVs\nbG8=\n",
+                "language": "tw"
+            })
+            assert "Akwaaba" in result[0].text
+            assert api.requests[-1]["content"] == b"Hello"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("audio_base64", [" SGVsbG8=", "SGVs bG8=", "SGVs\r\nbG8=", "\tSGVsbG8="])
+    async def test_asr_accepts_base64_with_whitespace(self, api, audio_base64):
+        """Test ASR ignores spaces, tabs and carriage returns in base64."""
+        api.respond(json_response({"transcription": "Akwaaba"}))
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_asr", {
+                "audio_base64": audio_base64,
+                "language": "tw"
+            })
+            assert "Akwaaba" in result[0].text
+            assert api.requests[-1]["content"] == b"Hello"
+
+    def test_malformed_base64_rejected_without_stripping(self):
+        """Test invalid base64 without whitespace fails without copying the input."""
+        class TrackedStr(str):
+            translated = False
+
+            def translate(self, table):
+                TrackedStr.translated = True
+                return super().translate(table)
+
+        for value in ("SGVs!G8=", "SGVsbG8"):
+            with pytest.raises(ValueError):
+                decode_audio_base64(TrackedStr(value))
+        assert not TrackedStr.translated
+
+    @pytest.mark.asyncio
+    async def test_asr_large_audio_decoded_off_loop(self, api):
+        """Test large base64 audio is decoded in a worker thread."""
+        api.respond(json_response({"transcription": "Akwaaba"}))
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            with patch("ghananlp_mcp.server.BASE64_OFFLOAD_THRESHOLD", 4), \
+                    patch("asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+                result = await call_tool("ghananlp_asr", {
+                    "audio_base64": "SGVsbG8=",
+                    "language": "tw"
+                })
+                assert "Akwaaba" in result[0].text
+                assert mock_to_thread.await_count == 1
+                assert api.requests[-1]["content"] == b"Hello"
+
+    @pytest.mark.asyncio
+    async def test_asr_requires_audio_source(self):
+        """Test ASR fails when neither audio_base64 nor audio_path is given."""
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_asr", {"language": "tw"})
+            assert len(result) == 1
+            assert "Invalid input" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_asr_missing_audio_file(self, tmp_path):
+        """Test ASR fails gracefully when audio_path does not exist."""
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_asr", {
+                "audio_path": str(tmp_path / "missing.mp3"),
+                "language": "tw"
+            })
+            assert len(result) == 1
+            assert "Invalid audio file" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_asr_audio_path_rejects_non_audio_file(self, api, tmp_path):
+        """Test ASR refuses to upload files that are not .wav or .mp3."""
+        secret = tmp_path / "id_rsa"
+        secret.write_bytes(b"private key")
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_asr", {"audio_path": str(secret), "language": "tw"})
+            assert "Invalid audio file" in result[0].text
+            assert api.requests == []
+
+    @pytest.mark.asyncio
+    async def test_asr_audio_path_rejects_symlink_to_non_audio_file(self, api, tmp_path):
+        """Test ASR checks the extension of the file a symlink points to."""
+        secret = tmp_path / "id_rsa"
+        secret.write_bytes(b"private key")
+        link = tmp_path / "clip.mp3"
+        link.symlink_to(secret)
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_asr", {"audio_path": str(link), "language": "tw"})
+            assert "Invalid audio file" in result[0].text
+            assert api.requests == []
+
+    @pytest.mark.asyncio
+    async def test_asr_audio_path_rejects_directory(self, api, tmp_path):
+        """Test ASR rejects a directory before sending anything."""
+        folder = tmp_path / "clips.mp3"
+        folder.mkdir()
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_asr", {"audio_path": str(folder), "language": "tw"})
+            assert "Invalid audio file" in result[0].text
+            assert api.requests == []
+
+    @pytest.mark.asyncio
+    async def test_asr_audio_path_outside_audio_dir(self, api, tmp_path):
+        """Test ASR rejects files outside GHANANLP_AUDIO_DIR when it is set."""
+        allowed = tmp_path / "allowed"
+        allowed.mkdir()
+        audio_file = tmp_path / "clip.mp3"
+        audio_file.write_bytes(b"fake-mp3-bytes")
+        env = {"GHANANLP_API_KEY": "test-key", "GHANANLP_AUDIO_DIR": str(allowed)}
+        with patch.dict(os.environ, env):
+            result = await call_tool("ghananlp_asr", {"audio_path": str(audio_file), "language": "tw"})
+            assert "GHANANLP_AUDIO_DIR" in result[0].text
+            assert api.requests == []
+
+    @pytest.mark.asyncio
+    async def test_asr_audio_path_streams_file(self, api, tmp_path):
+        """Test ASR uploads the raw file contents from audio_path."""
+        audio_file = tmp_path / "clip.mp3"
+        audio_file.write_bytes(b"fake-mp3-bytes")
+        uploaded = bytearray()
+
+        async def upload(url, content, headers, params):
+            async for chunk in content:
+                uploaded.extend(chunk)
+            return json_response({"transcription": "Akwaaba"})
+
+        api.handler = upload
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key", "GHANANLP_AUDIO_DIR": str(tmp_path)}):
+            with patch("asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+                result = await call_tool("ghananlp_asr", {
+                    "audio_path": str(audio_file),
+                    "language": "tw"
+                })
+            assert "Akwaaba" in result[0].text
+            assert bytes(uploaded) == b"fake-mp3-bytes"
+            # Path checks and size lookup run in one worker thread call
+            assert mock_to_thread.await_args_list[0].args[0] is resolve_audio_path
+            assert api.requests[-1]["headers"]["Content-Length"] == str(len(b"fake-mp3-bytes"))
+
 
 class TestTTS:
     """Test TTS (Text-to-Speech) functionality."""
@@ -135,6 +487,121 @@ class TestTTS:
             assert len(result) == 1
             assert "Invalid language" in result[0].text
 
+    @pytest.mark.asyncio
+    async def test_tts_cached(self, api):
+        """Test repeated synthesis is served from the cache."""
+        api.respond(audio_response(b"fake-mp3-bytes"))
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            args = {"text": "Akwaaba", "language": "tw"}
+            first = await call_tool("ghananlp_tts", args)
+            second = await call_tool("ghananlp_tts", args)
+            assert "ZmFrZS1tcDMtYnl0ZXM=" in first[0].text
+            assert first[0].text == second[0].text
+            assert len(api.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_tts_concurrent_requests_coalesced(self, api):
+        """Test concurrent identical TTS requests share one upstream call."""
+        async def slow_reply(url, **kwargs):
+            await asyncio.sleep(0.01)
+            return audio_response(b"fake-mp3-bytes")
+
+        api.handler = slow_reply
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            args = {"text": "Akwaaba", "language": "tw"}
+            results = await asyncio.gather(
+                *(call_tool("ghananlp_tts", args) for _ in range(5))
+            )
+            assert all("ZmFrZS1tcDMtYnl0ZXM=" in r[0].text for r in results)
+            assert len(api.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_tts_api_error_reports_body(self, api):
+        """Test API errors from the streamed TTS response include the body."""
+        api.respond(httpx.Response(
+            500, text="Service busy", request=httpx.Request("POST", "https://example.test")
+        ))
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            result = await call_tool("ghananlp_tts", {"text": "Akwaaba", "language": "tw"})
+            assert "API Error (500)" in result[0].text
+            assert "Service busy" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_api_concurrency_is_bounded_across_tools(self, api):
+        """Test concurrent calls to different tools share one in-flight limit."""
+        mock_response = audio_response(b"fake-mp3-bytes")
+        mock_response.aread = AsyncMock(return_value=orjson.dumps("Wo ho te sɛn?"))
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_reply(url, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return mock_response
+
+        with patch.dict(os.environ, {"GHANANLP_API_KEY": "test-key"}):
+            with patch("ghananlp_mcp.server._api_semaphore", asyncio.Semaphore(10)), \
+                    patch("ghananlp_mcp.server._translate_semaphore", asyncio.Semaphore(8)):
+                api.handler = slow_reply
+                await asyncio.gather(
+                    *(call_tool("ghananlp_translate", {"text": f"Line {i}", "language_pair": "en-tw"})
+                      for i in range(10)),
+                    *(call_tool("ghananlp_tts", {"text": f"Line {i}", "language": "tw"})
+                      for i in range(10)),
+                )
+                assert len(api.requests) == 20
+                assert max_in_flight == 10
+
+    @pytest.mark.asyncio
+    async def test_b64encode_stream_matches_b64encode(self):
+        """Test incremental encoding matches one-shot encoding for any chunking."""
+        data = bytes(range(256)) * 3 + b"tail"
+
+        for chunk_size in (1, 2, 3, 4, 5, 7, 64, len(data)):
+            async def chunks():
+                for i in range(0, len(data), chunk_size):
+                    yield data[i:i + chunk_size]
+
+            assert await b64encode_stream(chunks()) == base64.b64encode(data).decode("ascii")
+
+    @pytest.mark.asyncio
+    async def test_b64encode_stream_offloads_large_output(self):
+        """Test decoding a large encoded result runs in a worker thread."""
+        data = bytes(range(256)) * 3
+
+        async def chunks():
+            for i in range(0, len(data), 64):
+                yield data[i:i + 64]
+
+        with patch("ghananlp_mcp.server.BASE64_OFFLOAD_THRESHOLD", 16), \
+                patch("asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+            assert await b64encode_stream(chunks()) == base64.b64encode(data).decode("ascii")
+            assert mock_to_thread.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_b64encode_stream_small_output_stays_on_loop(self):
+        """Test small results are encoded without a worker thread."""
+        async def chunks():
+            yield b"fake-mp3-bytes"
+
+        with patch("asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+            assert await b64encode_stream(chunks()) == "ZmFrZS1tcDMtYnl0ZXM="
+            assert mock_to_thread.await_count == 0
+
+    def test_tts_cache_evicts_least_recently_used(self):
+        """Test the TTS cache stays under its byte cap."""
+        with patch("ghananlp_mcp.server.TTS_CACHE_MAX_BYTES", 10):
+            _tts_cache_put(("tw", "a"), ("12345", "audio/mpeg"))
+            _tts_cache_put(("tw", "b"), ("12345", "audio/mpeg"))
+            _tts_cache_put(("tw", "c"), ("12345", "audio/mpeg"))
+            assert list(_tts_cache) == [("tw", "b"), ("tw", "c")]
+
 
 class TestLanguageConstants:
     """Test language constant definitions."""
@@ -155,6 +622,78 @@ class TestLanguageConstants:
         """Test TTS languages list is not empty."""
         assert len(TTS_LANGUAGES) > 0
 
+    def test_language_sets_match_lists(self):
+        """Test the validation sets mirror the language lists."""
+        assert TRANSLATION_PAIRS_SET == set(TRANSLATION_PAIRS)
+        assert ASR_LANGUAGES_SET == set(ASR_LANGUAGES)
+        assert TTS_LANGUAGES_SET == set(TTS_LANGUAGES)
+
+
+class TestHttpClient:
+    """Test shared HTTP client lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused(self):
+        """Test that the same client is returned across calls."""
+        client = get_http_client()
+        try:
+            assert get_http_client() is client
+            assert str(client.base_url).startswith("https://translation-api.ghananlp.org")
+        finally:
+            await shutdown()
+
+    @pytest.mark.asyncio
+    async def test_client_uses_env_proxy(self):
+        """Test HTTPS_PROXY from the environment is still honoured."""
+        with patch.dict(os.environ, {"HTTPS_PROXY": "http://proxy.example:3128", "NO_PROXY": ""}):
+            client = get_http_client()
+        try:
+            pool = client._transport._pool
+            assert type(pool).__name__ == "AsyncHTTPProxy"
+            assert pool._proxy_url.host == b"proxy.example"
+        finally:
+            await shutdown()
+
+    @pytest.mark.asyncio
+    async def test_client_respects_no_proxy(self):
+        """Test NO_PROXY covering the API host disables the proxy."""
+        env = {"HTTPS_PROXY": "http://proxy.example:3128", "NO_PROXY": ".ghananlp.org"}
+        with patch.dict(os.environ, env):
+            client = get_http_client()
+        try:
+            assert type(client._transport._pool).__name__ != "AsyncHTTPProxy"
+        finally:
+            await shutdown()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_client(self):
+        """Test that shutdown closes the client and a new one is created after."""
+        client = get_http_client()
+        await shutdown()
+        assert client.is_closed
+        new_client = get_http_client()
+        try:
+            assert new_client is not client
+        finally:
+            await shutdown()
+
+
+class TestMain:
+    """Test the entry point."""
+
+    def test_main_runs_server(self):
+        """Test main runs the server on an event loop."""
+        with patch("ghananlp_mcp.server.run_server", new=AsyncMock()) as mock_run:
+            main()
+            mock_run.assert_awaited_once()
+
+    def test_main_without_uvloop(self):
+        """Test main falls back to asyncio when uvloop is unavailable."""
+        with patch("ghananlp_mcp.server.run_server", new=AsyncMock()) as mock_run, \
+                patch.dict("sys.modules", {"uvloop": None}):
+            main()
+            mock_run.assert_awaited_once()
+
 
 class TestUnknownTool:
     """Test handling of unknown tools."""